@@ -3,9 +3,9 @@ from flask_cors import CORS
 from dotenv import load_dotenv
 import prompts_schedules
 import os
+from models.schedule import Schedule, DAY_INDEX, extract_variables, parse_time
 from utils.decorators import log_request_response, init_logging
 from datetime import datetime
-import re
 import logging
 
 # Load environment variables
@@ -36,11 +36,6 @@ prompts_schedules.ensure_csv_exists()
 logger.info("Loading existing schedules")
 prompts_schedules.load_existing_schedules()
 
-def extract_variables(text: str) -> list[str]:
-    """Extract variables from text using {{variable}} pattern"""
-    matches = re.findall(r'{{([^}]+)}}', text)
-    return matches
-
 @app.route('/api/schedules', methods=['GET'])
 @log_request_response
 def get_schedules():
@@ -67,7 +62,7 @@ def create_schedule():
         # Extract variables from prompt and email title
         prompt_vars = extract_variables(data['prompt'])
         title_vars = extract_variables(data['email_title'])
-        all_vars = list(set(prompt_vars + title_vars))
+        all_vars = prompt_vars | title_vars
 
         # If variables are found, validate prompt_variables
         if all_vars and (not data.get('prompt_variables') or not isinstance(data['prompt_variables'], dict)):
@@ -97,9 +92,7 @@ def create_schedule():
         
         # Validate time format (HH:MM)
         try:
-            hour, minute = schedule['time'].split(':')
-            if not (0 <= int(hour) <= 23 and 0 <= int(minute) <= 59):
-                raise ValueError
+            parse_time(schedule['time'])
         except ValueError:
             return jsonify({'error': 'Invalid time format. Use HH:MM (24-hour format)'}), 400
         
@@ -107,8 +100,7 @@ def create_schedule():
         if schedule['type'] == 'weekly':
             if 'days' not in schedule or not schedule['days']:
                 return jsonify({'error': 'Weekly schedule must include days'}), 400
-            valid_days = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-            if not all(day.lower() in valid_days for day in schedule['days']):
+            if not all(day.lower() in DAY_INDEX for day in schedule['days']):
                 return jsonify({'error': 'Invalid days in weekly schedule'}), 400
         
         # Validate dates if provided
@@ -131,7 +123,7 @@ def create_schedule():
                 if end_date <= start_date:
                     return jsonify({'error': 'end_date must be after start_date'}), 400
         
-        new_schedule = prompts_schedules.add_schedule(data)
+        new_schedule = prompts_schedules.add_schedule(Schedule.from_dict(data))
             
         return jsonify(new_schedule), 201
     except Exception as e:
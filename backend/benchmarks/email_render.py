@@ -0,0 +1,37 @@
+"""
+Micro-benchmark for email rendering time per message
+
+Run from the backend directory:
+    python -m benchmarks.email_render
+"""
+import timeit
+import markdown2
+from gateway.email_api import HTML_HEAD, HTML_TAIL, MARKDOWN_EXTRAS, StaticSection, render_html
+
+HEADER = (
+    "## Prompt Template\nWhat are the latest developments in {{topic}} in {{region}}?\n\n"
+    "## Email Title Template\n{{topic}} news for {{region}}\n\n"
+    "## Prompt Variables\n"
+)
+BODY = (
+    "- **topic**: renewable energy\n- **region**: Europe\n\n"
+    "## Prompt\nWhat are the latest developments in renewable energy in Europe?\n\n"
+    "## Response\n" + "Solar capacity grew again this year, see [example.com](https://example.com/solar).\n\n" * 20 +
+    "\n\n##Sources:\n- [example.com](https://example.com/solar)\n"
+)
+
+def render_baseline() -> str:
+    """Render the whole email the way each message was rendered before the pipeline"""
+    return HTML_HEAD + markdown2.markdown(HEADER + BODY, extras=list(MARKDOWN_EXTRAS)) + HTML_TAIL
+
+def main(number: int = 500):
+    header = StaticSection(HEADER)
+    results = {
+        'baseline': timeit.timeit(render_baseline, number=number),
+        'pipeline': timeit.timeit(lambda: render_html(BODY, header), number=number),
+    }
+    for name, total in results.items():
+        print(f"{name}: {total / number * 1000:.3f} ms per email")
+
+if __name__ == '__main__':
+    main()
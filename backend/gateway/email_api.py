@@ -1,6 +1,8 @@
 import os
 import logging
 import smtplib
+import threading
+from typing import Optional
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from dotenv import load_dotenv
@@ -12,87 +14,111 @@ load_dotenv()
 # Configure logging
 logger = logging.getLogger('promptcron')
 
-def convert_markdown_to_html(text: str) -> str:
-    """Convert markdown text to HTML with extras enabled"""
-    return markdown2.markdown(
-        text,
-        extras=[
-            "fenced-code-blocks",
-            "tables",
-            "break-on-newline",
-            "cuddled-lists",
-            "target-blank-links"
-        ]
-    ) 
-
-def send_email(to_emails, subject, body):
-    """Send email using SMTP with HTML support"""
-    smtp_server = "smtp.gmail.com"
-    smtp_port = 465
-    smtp_username = os.getenv('SMTP_USERNAME')
-    smtp_password = os.getenv('SMTP_PASSWORD')
-
-    msg = MIMEMultipart('alternative')
-    msg['From'] = smtp_username
-    msg['To'] = ', '.join(to_emails)
-    msg['Subject'] = subject
+MARKDOWN_EXTRAS = [
+    "fenced-code-blocks",
+    "tables",
+    "break-on-newline",
+    "cuddled-lists",
+    "target-blank-links"
+]
 
-    # Convert markdown to HTML and add styling
-    html_content = f"""
+# HTML shell compiled once; the converted body is placed between head and tail
+HTML_HEAD = """
     <html>
         <head>
             <style>
-                body {{
+                body {
                     font-family: Arial, sans-serif;
                     line-height: 1.6;
                     color: #333;
                     max-width: 800px;
                     margin: 0 auto;
                     padding: 20px;
-                }}
-                .prompt {{
+                }
+                .prompt {
                     background-color: #f5f5f5;
                     padding: 15px;
                     border-radius: 5px;
                     margin-bottom: 20px;
-                }}
-                .response {{
+                }
+                .response {
                     margin-bottom: 20px;
-                }}
-                .sources {{
+                }
+                .sources {
                     border-top: 1px solid #ddd;
                     padding-top: 15px;
                     margin-top: 20px;
-                }}
-                a {{
+                }
+                a {
                     color: #0066cc;
                     text-decoration: none;
-                }}
-                a:hover {{
+                }
+                a:hover {
                     text-decoration: underline;
-                }}
-                code {{
+                }
+                code {
                     background-color: #f8f8f8;
                     padding: 2px 4px;
                     border-radius: 3px;
                     font-family: monospace;
-                }}
-                pre {{
+                }
+                pre {
                     background-color: #f8f8f8;
                     padding: 15px;
                     border-radius: 5px;
                     overflow-x: auto;
-                }}
+                }
             </style>
         </head>
         <body>
-            {convert_markdown_to_html(body)}
+            """
+HTML_TAIL = """
         </body>
     </html>
     """
 
+# Markdown converters are reused per thread since scheduled jobs run concurrently
+_converters = threading.local()
+
+def convert_markdown_to_html(text: str) -> str:
+    """Convert markdown text to HTML with extras enabled"""
+    converter = getattr(_converters, 'markdown', None)
+    if converter is None:
+        converter = _converters.markdown = markdown2.Markdown(extras=MARKDOWN_EXTRAS)
+    return converter.convert(text)
+
+class StaticSection:
+    """Markdown shared by several emails, converted to HTML once"""
+    __slots__ = ('text', 'html')
+
+    def __init__(self, text: str):
+        self.text = text
+        self.html = convert_markdown_to_html(text)
+
+def render_html(body: str, header: Optional[StaticSection] = None) -> str:
+    """Render the HTML email, converting only the varying body markdown"""
+    header_html = header.html if header else ''
+    return ''.join((HTML_HEAD, header_html, convert_markdown_to_html(body), HTML_TAIL))
+
+def send_email(to_emails, subject, body, header: Optional[StaticSection] = None):
+    """Send email using SMTP with HTML support
+    The optional header is prepended to the body in both plain text and HTML
+    """
+    smtp_server = "smtp.gmail.com"
+    smtp_port = 465
+    smtp_username = os.getenv('SMTP_USERNAME')
+    smtp_password = os.getenv('SMTP_PASSWORD')
+
+    msg = MIMEMultipart('alternative')
+    msg['From'] = smtp_username
+    msg['To'] = ', '.join(to_emails)
+    msg['Subject'] = subject
+
+    plain_content = header.text + body if header else body
+    html_content = render_html(body, header)
+
     # Attach both plain text and HTML versions
-    msg.attach(MIMEText(body, 'plain'))
+    msg.attach(MIMEText(plain_content, 'plain'))
     msg.attach(MIMEText(html_content, 'html'))
 
     logger.info(f"Sending email to {to_emails}, subject: {subject}")
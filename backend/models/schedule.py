@@ -0,0 +1,168 @@
+import re
+import sys
+import json
+import pytz
+from datetime import datetime, tzinfo
+from itertools import product
+from typing import List, Optional, Tuple
+from apscheduler.triggers.cron import CronTrigger
+
+# Matches {{variable}} placeholders in prompts and email titles
+VARIABLE_PATTERN = re.compile(r'{{([^}]+)}}')
+
+DAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+DAY_INDEX = {day: index for index, day in enumerate(DAYS)}
+
+# Timezone objects shared by every schedule, keyed by zone name
+_timezones: dict[str, tzinfo] = {}
+
+def get_timezone(name: str) -> tzinfo:
+    """Get the shared timezone object for a zone name"""
+    timezone = _timezones.get(name)
+    if timezone is None:
+        timezone = _timezones[name] = pytz.timezone(name)
+    return timezone
+
+def extract_variables(text: str) -> set[str]:
+    """Extract variables from text using {{variable}} pattern"""
+    return set(VARIABLE_PATTERN.findall(text))
+
+def parse_time(value: str) -> Tuple[int, int]:
+    """Parse an HH:MM (24-hour format) string into (hour, minute)"""
+    hour, minute = (int(part) for part in value.split(':'))
+    if not (0 <= hour <= 23 and 0 <= minute <= 59):
+        raise ValueError(f"Invalid time: {value}")
+    return hour, minute
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+class Template:
+    """A {{variable}} template split into literal and variable parts once"""
+    __slots__ = ('text', 'parts', 'variables')
+
+    def __init__(self, text: str):
+        self.text = text
+        # Splitting on the capturing pattern alternates literal text and variable names
+        self.parts = tuple(VARIABLE_PATTERN.split(text))
+        self.variables = frozenset(self.parts[1::2])
+
+    def render(self, values: dict) -> str:
+        """Substitute variable values, leaving unknown variables untouched"""
+        if not self.variables:
+            return self.text
+        parts = list(self.parts)
+        for i in range(1, len(parts), 2):
+            name = parts[i]
+            parts[i] = values[name] if name in values else f"{{{{{name}}}}}"
+        return ''.join(parts)
+
+class Schedule:
+    """A prompt schedule parsed once and shared by the API and the scheduler"""
+    __slots__ = (
+        'id', 'emails', 'prompt', 'email_title', 'prompt_variables',
+        'schedule_type', 'hour', 'minute', 'timezone', 'days',
+        'start_date', 'end_date', 'trigger'
+    )
+
+    def __init__(self, id, emails, prompt: str, email_title: str, prompt_variables: dict,
+                 schedule_type: str, hour: int, minute: int, timezone: tzinfo, days=(),
+                 start_date: Optional[datetime] = None, end_date: Optional[datetime] = None):
+        self.id = id
+        self.emails = tuple(emails)
+        self.prompt = Template(prompt)
+        self.email_title = Template(email_title)
+        self.prompt_variables = {
+            sys.intern(name): tuple(values) for name, values in prompt_variables.items()
+        }
+        self.schedule_type = sys.intern(schedule_type)
+        self.hour = hour
+        self.minute = minute
+        self.timezone = timezone
+        # Day of week indices, Monday being 0
+        self.days = tuple(days)
+        self.start_date = start_date
+        self.end_date = end_date
+        self.trigger = self._build_trigger()
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Schedule':
+        """Create a schedule from its API representation"""
+        schedule = data['schedule']
+        hour, minute = parse_time(schedule['time'])
+        days = ()
+        if schedule['type'] == 'weekly':
+            days = (DAY_INDEX[day.lower()] for day in schedule.get('days') or [])
+        return cls(
+            id=data['id'],
+            emails=data['emails'],
+            prompt=data['prompt'],
+            email_title=data['email_title'],
+            prompt_variables=data.get('prompt_variables') or {},
+            schedule_type=schedule['type'],
+            hour=hour,
+            minute=minute,
+            timezone=get_timezone(schedule['timezone']),
+            days=days,
+            start_date=_parse_date(data.get('start_date')),
+            end_date=_parse_date(data.get('end_date'))
+        )
+
+    @property
+    def job_id(self) -> str:
+        return str(self.id)
+
+    @property
+    def time(self) -> str:
+        return f"{self.hour:02d}:{self.minute:02d}"
+
+    def _build_trigger(self) -> CronTrigger:
+        trigger_kwargs = {
+            'hour': self.hour,
+            'minute': self.minute,
+            'timezone': self.timezone
+        }
+        if self.days:
+            trigger_kwargs['day_of_week'] = ','.join(str(day) for day in self.days)
+        if self.start_date:
+            trigger_kwargs['start_date'] = self.start_date
+        if self.end_date:
+            trigger_kwargs['end_date'] = self.end_date
+        return CronTrigger(**trigger_kwargs)
+
+    def combinations(self) -> List[Tuple[str, str, dict]]:
+        """Generate all possible combinations of prompt and email title variables
+        Returns:
+            List of tuples (formatted_prompt, formatted_title, used_values_dict)
+        """
+        # Only include variables that are actually used in either prompt or title
+        all_vars = self.prompt.variables | self.email_title.variables
+        var_names = [name for name in self.prompt_variables if name in all_vars]
+        var_values = [self.prompt_variables[name] for name in var_names]
+
+        combinations = []
+        for values in product(*var_values):
+            current_values = dict(zip(var_names, values))
+            combinations.append((
+                self.prompt.render(current_values),
+                self.email_title.render(current_values),
+                current_values
+            ))
+
+        return combinations
+
+    def to_row(self) -> dict:
+        """Get the CSV row representation of the schedule"""
+        return {
+            'id': self.id,
+            'emails': json.dumps(list(self.emails)),
+            'prompt': self.prompt.text,
+            'email_title': self.email_title.text,
+            'prompt_variables': json.dumps({name: list(values) for name, values in self.prompt_variables.items()}),
+            'schedule_type': self.schedule_type,
+            'time': self.time,
+            'timezone': self.timezone.zone,
+            'days': json.dumps([DAYS[day] for day in self.days]),
+            'start_date': self.start_date.isoformat() if self.start_date else None,
+            'end_date': self.end_date.isoformat() if self.end_date else None
+        }
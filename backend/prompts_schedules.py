@@ -1,15 +1,11 @@
 import os
 import pandas as pd
 import json
-import pytz
-from datetime import datetime
-from itertools import product
 from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
-from gateway.email_api import send_email
+from gateway.email_api import StaticSection, send_email
 from gateway.llm_api import get_ai_response
+from models.schedule import Schedule
 import logging
-import re
 
 # Configure logging
 logger = logging.getLogger('promptcron')
@@ -68,7 +64,7 @@ def get_all_schedules():
     
     return schedules
 
-def add_schedule(schedule_data):
+def add_schedule(schedule: Schedule):
     """Add a new schedule"""
     ensure_csv_exists()
     
@@ -76,72 +72,37 @@ def add_schedule(schedule_data):
     df = pd.read_csv(SCHEDULES_FILE)
     
     # Prepare new schedule data
-    new_schedule = {
-        'id': schedule_data['id'],
-        'emails': json.dumps(schedule_data['emails']),
-        'prompt': schedule_data['prompt'],
-        'email_title': schedule_data['email_title'],
-        'prompt_variables': json.dumps(schedule_data['prompt_variables']),
-        'schedule_type': schedule_data['schedule']['type'],
-        'time': schedule_data['schedule']['time'],
-        'timezone': schedule_data['schedule']['timezone'],
-        'days': json.dumps(schedule_data['schedule'].get('days', [])),
-        'start_date': schedule_data.get('start_date', None),
-        'end_date': schedule_data.get('end_date', None)
-    }
+    new_schedule = schedule.to_row()
     
     # Append new schedule
     df = pd.concat([df, pd.DataFrame([new_schedule])], ignore_index=True)
     df.to_csv(SCHEDULES_FILE, index=False)
     
     # Schedule the job
-    schedule_job(schedule_data)
+    schedule_job(schedule)
     
     return new_schedule
 
-def schedule_job(schedule_data):
-    """Schedule a job with APScheduler"""
+def schedule_job(schedule: Schedule):
+    """Schedule a job with APScheduler using the schedule's precomputed trigger"""
     try:
-        job_id = str(schedule_data['id'])
-        schedule_type = schedule_data['schedule']['type']
-        time_parts = schedule_data['schedule']['time'].split(':')
-        timezone = pytz.timezone(schedule_data['schedule']['timezone'])
+        job_id = schedule.job_id
         
-        # Create trigger kwargs
-        trigger_kwargs = {
-            'hour': int(time_parts[0]),
-            'minute': int(time_parts[1]),
-            'timezone': timezone
-        }
-        
-        # Add day of week for weekly schedules
-        if schedule_type == 'weekly':
-            days = schedule_data['schedule'].get('days', [])
-            standard_days = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-            if days:
-                trigger_kwargs['day_of_week'] = ','.join(str(standard_days.index(day)) for day in days)
-        
-        # Add start and end dates if specified
-        if 'start_date' in schedule_data and schedule_data['start_date']:
-            trigger_kwargs['start_date'] = datetime.fromisoformat(schedule_data['start_date'])
-            logger.info(f"Schedule {job_id} will start at {schedule_data['start_date']}")
-            
-        if 'end_date' in schedule_data and schedule_data['end_date']:
-            trigger_kwargs['end_date'] = datetime.fromisoformat(schedule_data['end_date'])
-            logger.info(f"Schedule {job_id} will end at {schedule_data['end_date']}")
+        if schedule.start_date:
+            logger.info(f"Schedule {job_id} will start at {schedule.start_date.isoformat()}")
+        if schedule.end_date:
+            logger.info(f"Schedule {job_id} will end at {schedule.end_date.isoformat()}")
         
-        # Create and add job
-        trigger = CronTrigger(**trigger_kwargs)
         scheduler.add_job(
             execute_prompt,
-            trigger=trigger,
+            trigger=schedule.trigger,
             id=job_id,
             replace_existing=True,
-            args=[schedule_data]
+            args=[schedule]
         )
-        logger.info(f"Successfully scheduled job {job_id}, {trigger_kwargs}")
+        logger.info(f"Successfully scheduled job {job_id}, {schedule.trigger}")
     except Exception as e:
-        logger.error(f"Error scheduling job {schedule_data['id']}: {str(e)}")
+        logger.error(f"Error scheduling job {schedule.id}: {str(e)}")
         raise
 
 def delete_schedule(schedule_id):
@@ -162,58 +123,20 @@ def delete_schedule(schedule_id):
     
     return True
 
-def extract_variables(text: str) -> set[str]:
-    """Extract variables from text using {{variable}} pattern"""
-    matches = re.findall(r'{{([^}]+)}}', text)
-    return set(matches)
-
-def generate_combinations(prompt: str, email_title: str, prompt_variables: dict) -> list[tuple[str, str, dict]]:
-    """Generate all possible combinations of prompt and email title variables
-    Returns:
-        List of tuples (formatted_prompt, formatted_title, used_values_dict)
-    """
-    # Extract variables from both prompt and title
-    prompt_vars = extract_variables(prompt)
-    title_vars = extract_variables(email_title)
-    all_vars = prompt_vars.union(title_vars)
-    
-    # Get all variable names and their possible values
-    # Only include variables that are actually used in either prompt or title
-    var_names = [name for name in prompt_variables.keys() if name in all_vars]
-    var_values = [prompt_variables[name] for name in var_names]
-    
-    # Generate all possible combinations
-    combinations = []
-    for values in product(*var_values):
-        # Create a dictionary of the current combination
-        current_values = dict(zip(var_names, values))
-        
-        # Format both prompt and title with current values
-        formatted_prompt = prompt
-        formatted_title = email_title
-        for var_name, value in current_values.items():
-            if var_name in prompt_vars:
-                formatted_prompt = formatted_prompt.replace(f"{{{{{var_name}}}}}", value)
-            if var_name in title_vars:
-                formatted_title = formatted_title.replace(f"{{{{{var_name}}}}}", value)
-            
-        combinations.append((formatted_prompt, formatted_title, current_values))
-    
-    return combinations
-
-def execute_prompt(schedule_data):
+def execute_prompt(schedule: Schedule):
     """Execute a scheduled prompt for all variable combinations"""
     try:
-        logger.info(f"Executing prompt for schedule {schedule_data['id']}, {schedule_data['prompt']}")
+        logger.info(f"Executing prompt for schedule {schedule.id}, {schedule.prompt.text}")
         
         # Generate all prompt and title combinations
-        combinations = generate_combinations(
-            schedule_data['prompt'],
-            schedule_data['email_title'],
-            schedule_data['prompt_variables']
-        )
+        combinations = schedule.combinations()
         
-        logger.info(f"Generated {len(combinations)} combinations for schedule {schedule_data['id']}")
+        logger.info(f"Generated {len(combinations)} combinations for schedule {schedule.id}")
+        
+        # Template sections are the same for every combination, so render them once per run
+        header = StaticSection(
+            f"## Prompt Template\n{schedule.prompt.text}\n\n## Email Title Template\n{schedule.email_title.text}\n\n## Prompt Variables\n"
+        )
         
         # Process each combination
         for formatted_prompt, formatted_title, used_values in combinations:
@@ -221,12 +144,8 @@ def execute_prompt(schedule_data):
                 # Get AI response with citations
                 response_content, citations = get_ai_response(formatted_prompt)
                 
-                # Create email body with prompt, response, and citations in Markdown format
-                email_body = f"""## Prompt Template\n{schedule_data['prompt']}\n\n## Email Title Template\n{schedule_data['email_title']}\n\n## Prompt Variables\n"""
-                # Add used variable values
-                for var_name, value in used_values.items():
-                    email_body += f"- **{var_name}**: {value}\n"
-                
+                # Create email body with variables, prompt, response, and citations in Markdown format
+                email_body = ''.join(f"- **{var_name}**: {value}\n" for var_name, value in used_values.items())
                 email_body += f"\n## Prompt\n{formatted_prompt}\n\n## Response\n{response_content}"
 
                 if citations:
@@ -234,20 +153,21 @@ def execute_prompt(schedule_data):
                 
                 # Send email with formatted title
                 send_email(
-                    schedule_data['emails'],
+                    schedule.emails,
                     formatted_title,
-                    email_body
+                    email_body,
+                    header=header
                 )
-                logger.info(f"Successfully sent email for combination {used_values} of schedule {schedule_data['id']}")
+                logger.info(f"Successfully sent email for combination {used_values} of schedule {schedule.id}")
                 
             except Exception as e:
-                logger.error(f"Error processing combination {used_values} for schedule {schedule_data['id']}: {str(e)}")
+                logger.error(f"Error processing combination {used_values} for schedule {schedule.id}: {str(e)}")
                 continue  # Continue with next combination even if one fails
                 
-        logger.info(f"Completed processing all combinations for schedule {schedule_data['id']}")
+        logger.info(f"Completed processing all combinations for schedule {schedule.id}")
         
     except Exception as e:
-        logger.error(f"Error executing prompt for schedule {schedule_data['id']}: {str(e)}")
+        logger.error(f"Error executing prompt for schedule {schedule.id}: {str(e)}")
 
 def load_existing_schedules():
     """Load existing schedules from CSV"""
@@ -256,7 +176,7 @@ def load_existing_schedules():
         schedules = get_all_schedules()
         for schedule in schedules:
             try:
-                schedule_job(schedule)
+                schedule_job(Schedule.from_dict(schedule))
             except Exception as e:
                 logger.error(f"Failed to schedule job {schedule['id']}: {str(e)}")
         logger.info(f"Successfully loaded and scheduled {len(schedules)} schedules")